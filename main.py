@@ -9,13 +9,16 @@ import sys
 import yaml
 import logging
 import argparse
+from datetime import datetime
 from pathlib import Path
 
-from src.news_fetcher import NewsFetcher
-from src.funding_tracker import FundingTracker
+try:
+    from yaml import CSafeLoader as YamlLoader  # libyaml-backed, much faster
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 from src.digest_generator import DigestGenerator
 from src.email_sender import EmailSender
-from src.ai_summarizer import AISummarizer
 
 # Configure logging
 logging.basicConfig(
@@ -29,7 +32,7 @@ def load_config(config_path: str = "config/companies.yaml") -> dict:
     """Load configuration from YAML file"""
     try:
         with open(config_path, 'r') as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=YamlLoader)
         logger.info(f"Loaded configuration from {config_path}")
         return config
     except FileNotFoundError:
@@ -75,6 +78,11 @@ def main():
         default=7,
         help='Number of days to look back for news (default: 7)'
     )
+    parser.add_argument(
+        '--save-digest',
+        action='store_true',
+        help='Also save the digest to the output/ folder (for debugging/archiving)'
+    )
     parser.add_argument(
         '--skip-ai-summaries',
         action='store_true',
@@ -108,7 +116,8 @@ def main():
     # Test mode - send test email and exit
     if args.test:
         logger.info("Running in TEST mode")
-        success = email_sender.send_test_email(recipient_email)
+        with email_sender:
+            success = email_sender.send_test_email(recipient_email)
         if success:
             logger.info("✓ Test email sent successfully!")
             logger.info("Check your inbox to confirm receipt")
@@ -120,7 +129,8 @@ def main():
     # Regular mode - generate and send digest
     logger.info("Fetching news for portfolio companies...")
 
-    # Fetch news
+    # Fetch news (heavy imports are deferred so --test mode stays fast)
+    from src.news_fetcher import NewsFetcher
     news_fetcher = NewsFetcher(days_back=args.days)
     news_data = news_fetcher.fetch_all_companies_news(companies)
 
@@ -128,6 +138,7 @@ def main():
     funding_data = None
     if not args.skip_funding:
         logger.info("Fetching funding information...")
+        from src.funding_tracker import FundingTracker
         funding_tracker = FundingTracker()
         funding_data = funding_tracker.get_all_funding_info(companies)
     else:
@@ -140,6 +151,7 @@ def main():
         if anthropic_api_key:
             logger.info("Generating AI summaries with Claude...")
             try:
+                from src.ai_summarizer import AISummarizer
                 ai_summarizer = AISummarizer(anthropic_api_key)
                 ai_summaries = ai_summarizer.summarize_all_companies(news_data)
                 logger.info("AI summaries generated successfully")
@@ -155,27 +167,32 @@ def main():
     # Generate digest
     logger.info("Generating digest...")
     digest_gen = DigestGenerator()
-    digest_body = digest_gen.generate_digest(news_data, funding_data, ai_summaries)
-    subject = digest_gen.generate_subject_line(news_data)
 
-    # Save digest to file (for debugging/logging)
-    output_dir = Path("output")
-    output_dir.mkdir(exist_ok=True)
+    if args.save_digest:
+        # Write digest straight to file (for debugging/logging), then reuse it as the email body
+        output_dir = Path("output")
+        output_dir.mkdir(exist_ok=True)
 
-    from datetime import datetime
-    output_file = output_dir / f"digest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
+        output_file = output_dir / f"digest_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
 
-    with open(output_file, 'w') as f:
-        f.write(digest_body)
-    logger.info(f"Digest saved to: {output_file}")
+        with open(output_file, 'w+') as f:
+            digest_gen.generate_digest(news_data, funding_data, ai_summaries, out=f)
+            f.seek(0)
+            digest_body = f.read()
+        logger.info(f"Digest saved to: {output_file}")
+    else:
+        digest_body = digest_gen.generate_digest(news_data, funding_data, ai_summaries)
+
+    subject = digest_gen.generate_subject_line(digest_gen.last_stats)
 
     # Send email
     logger.info(f"Sending digest to: {recipient_email}")
-    success = email_sender.send_digest(
-        recipient_email=recipient_email,
-        subject=subject,
-        body=digest_body
-    )
+    with email_sender:
+        success = email_sender.send_digest(
+            recipient_email=recipient_email,
+            subject=subject,
+            body=digest_body
+        )
 
     if success:
         logger.info("=" * 80)
@@ -2,25 +2,162 @@
 AI Summarizer Module - Uses Claude API to generate intelligent summaries
 """
 
+import json
+import hashlib
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
-import anthropic
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+
+from src.disk_cache import DiskCache
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent Claude requests (keeps us under API rate limits)
+MAX_WORKERS = 8
+
+# Summaries for an unchanged article set are reused for up to a week
+CACHE_TTL = 7 * 24 * 60 * 60
+
+# Default summary guidelines for a single company. The output format is added
+# separately (SINGLE_FORMAT / BATCH_FORMAT) so batched calls don't inherit a
+# conflicting "respond with only" instruction.
+INVESTOR_PROMPT = """You are analyzing news headlines about a portfolio company. Create a brief 2-3 sentence summary for an investor.
+
+IMPORTANT INSTRUCTIONS:
+- Work with whatever information is available, even if limited to just headlines
+- Be concise and direct - NO apologies or meta-commentary about limited information
+- Focus on what IS mentioned, not what's missing
+- If only headlines are available, synthesize what you can infer
+- Use confident, factual language"""
+
+# Output format when one company is summarized per call
+SINGLE_FORMAT = """Respond with only the summary text."""
+
+# Output format when several companies share one call
+BATCH_FORMAT = """You will be given several companies. Follow the instructions above for each company separately, then respond with only a JSON object mapping each company name, exactly as given, to its summary: {"company_name": "summary", ...}"""
+
+# Number of companies summarized per batched Claude call
+BATCH_SIZE = 8
+
+
+def _is_transient(error: BaseException) -> bool:
+    """Only connection failures, rate limits and server-side errors are worth retrying"""
+    import anthropic  # Already loaded by AISummarizer.__init__
+
+    if isinstance(error, (anthropic.APIConnectionError, anthropic.RateLimitError)):
+        return True
+    # 5xx, including 529 "overloaded" (a separate class in newer SDKs)
+    return isinstance(error, anthropic.APIStatusError) and error.status_code >= 500
+
 
 class AISummarizer:
     """Uses Claude API to generate intelligent summaries of company news"""
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        cache_path: str = ".cache/ai_summaries",
+        *,
+        max_articles: int = 3,
+        prompt_template: str = INVESTOR_PROMPT
+    ):
         """
         Initialize the AI summarizer
 
         Args:
             api_key: Anthropic API key
+            cache_path: Path of the on-disk summary cache
+            max_articles: Number of top articles per company sent to Claude
+            prompt_template: Guidelines for the summary to write, without an
+                output format (added per call type)
+        """
+        self.max_articles = max_articles
+        self.prompt_template = prompt_template
+        # System prompts are kept byte-identical across calls so Anthropic
+        # can serve them from the prompt cache
+        self.single_prompt = f"{prompt_template}\n\n{SINGLE_FORMAT}"
+        self.batch_prompt = f"{prompt_template}\n\n{BATCH_FORMAT}"
+
+        import anthropic  # Deferred: the SDK is slow to import and only needed here
+
+        # Transient errors are retried by _call_claude, so disable the SDK's own retries
+        self.client = anthropic.Anthropic(api_key=api_key, max_retries=0)
+        self.cache = DiskCache(cache_path, ttl=CACHE_TTL)
+
+    def _cache_key(self, company_name: str, articles: List[Dict]) -> str:
+        """Hash the prompt, company and articles that feed its summary"""
+        parts = [self.prompt_template, company_name]
+        parts.extend(article['title'] + article['link'] for article in articles[:self.max_articles])
+        return hashlib.sha256("\n".join(parts).encode('utf-8')).hexdigest()
+
+    def _build_prompt(self, company_name: str, articles: List[Dict]) -> str:
+        """Format a company's top articles for the user message (no I/O)"""
+        article_text = []
+        for i, article in enumerate(articles[:self.max_articles], 1):
+            article_text.append(
+                f"{i}. {article['title']}\n"
+                f"   Date: {article['published']}\n"
+                f"   Summary: {article.get('summary', 'No summary available')}\n"
+            )
+
+        articles_str = "\n".join(article_text)
+        return f"Company: {company_name}\nArticles:\n{articles_str}"
+
+    @retry(
+        retry=retry_if_exception(_is_transient),
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(max=10),
+        reraise=True
+    )
+    def _call_claude(self, system: str, prompt: str, max_tokens: int = 300) -> str:
+        """
+        Send a prompt to Claude, retrying transient failures
+
+        Permanent errors (bad key, bad request, ...) are raised immediately.
+
+        Args:
+            system: Static system instructions (served from the prompt cache)
+            prompt: Company-specific user message
+            max_tokens: Maximum tokens in the response
+
+        Returns:
+            The response text
         """
-        self.client = anthropic.Anthropic(api_key=api_key)
+        message = self.client.messages.create(
+            model="claude-3-5-haiku-20241022",  # Using Haiku for cost-efficiency
+            max_tokens=max_tokens,
+            system=[
+                {
+                    "type": "text",
+                    "text": system,
+                    "cache_control": {"type": "ephemeral"}
+                }
+            ],
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return message.content[0].text
+
+    @staticmethod
+    def _parse_batch_response(text: str) -> Dict[str, str]:
+        """Extract the company -> summary JSON object from a batch response"""
+        # Tolerate code fences or stray text around the JSON object
+        start = text.find('{')
+        end = text.rfind('}')
+        if start == -1 or end < start:
+            raise ValueError("No JSON object in response")
+
+        parsed = json.loads(text[start:end + 1])
+        if not isinstance(parsed, dict):
+            raise ValueError("Response is not a JSON object")
+
+        return {
+            str(name): summary.strip()
+            for name, summary in parsed.items()
+            if isinstance(summary, str) and summary.strip()
+        }
 
     def summarize_company_news(
         self,
@@ -40,50 +177,73 @@ class AISummarizer:
         if not articles:
             return None
 
+        # Reuse the previous summary if the article set hasn't changed
+        cache_key = self._cache_key(company_name, articles)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Using cached AI summary for {company_name}")
+            return cached
+
+        # Only the company-specific part goes in the user message
+        prompt = self._build_prompt(company_name, articles)
+
         try:
-            # Prepare article data for the prompt
-            article_text = []
-            for i, article in enumerate(articles[:3], 1):  # Limit to top 3 articles
-                article_text.append(
-                    f"{i}. {article['title']}\n"
-                    f"   Date: {article['published']}\n"
-                    f"   Summary: {article.get('summary', 'No summary available')}\n"
-                )
+            response = self._call_claude(self.single_prompt, prompt)
+            summary = response.strip()
+            logger.info(f"Generated AI summary for {company_name}")
+            self.cache.set(cache_key, summary)
+            return summary
 
-            articles_str = "\n".join(article_text)
+        except Exception as e:
+            logger.error(f"Error generating AI summary for {company_name}: {e}")
+            # Fallback to simple concatenation
+            return self._fallback_summary(company_name, articles)
 
-            # Create prompt for Claude
-            prompt = f"""Analyze these news headlines about {company_name} and create a brief 2-3 sentence summary for an investor.
+    def summarize_batch(
+        self,
+        companies_to_articles: Dict[str, List[Dict]]
+    ) -> Dict[str, str]:
+        """
+        Generate summaries for several companies with a single API call
 
-IMPORTANT INSTRUCTIONS:
-- Work with whatever information is available, even if limited to just headlines
-- Be concise and direct - NO apologies or meta-commentary about limited information
-- Focus on what IS mentioned, not what's missing
-- If only headlines are available, synthesize what you can infer
-- Use confident, factual language
+        Companies missing from the response, or the whole batch if the call
+        fails or can't be parsed, are left out of the result so the caller
+        can summarize them individually (and concurrently).
 
-Headlines/Articles:
-{articles_str}
+        Args:
+            companies_to_articles: Dictionary mapping company names to article lists
 
-Write a concise 2-3 sentence investor summary:"""
+        Returns:
+            Dictionary mapping company names to their summaries
+        """
+        summaries = {}
 
-            # Call Claude API
-            message = self.client.messages.create(
-                model="claude-3-5-haiku-20241022",  # Using Haiku for cost-efficiency
-                max_tokens=300,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
+        # A single company doesn't need the batch prompt
+        if len(companies_to_articles) > 1:
+            prompt = "\n\n".join(
+                self._build_prompt(company_name, articles)
+                for company_name, articles in companies_to_articles.items()
             )
 
-            summary = message.content[0].text.strip()
-            logger.info(f"Generated AI summary for {company_name}")
-            return summary
+            try:
+                response = self._call_claude(
+                    self.batch_prompt,
+                    prompt,
+                    max_tokens=300 * len(companies_to_articles)
+                )
+                parsed = self._parse_batch_response(response)
 
-        except Exception as e:
-            logger.error(f"Error generating AI summary for {company_name}: {e}")
-            # Fallback to simple concatenation
-            return self._fallback_summary(company_name, articles)
+                for company_name, articles in companies_to_articles.items():
+                    summary = parsed.get(company_name)
+                    if summary:
+                        logger.info(f"Generated AI summary for {company_name}")
+                        self.cache.set(self._cache_key(company_name, articles), summary)
+                        summaries[company_name] = summary
+
+            except Exception as e:
+                logger.warning(f"Batch summary failed, summarizing companies individually: {e}")
+
+        return summaries
 
     def _fallback_summary(self, company_name: str, articles: List[Dict]) -> str:
         """
@@ -125,14 +285,53 @@ Write a concise 2-3 sentence investor summary:"""
         Returns:
             Dictionary mapping company names to their AI-generated summaries
         """
-        summaries = {}
+        summaries = {company_name: None for company_name in news_data}
 
+        # Only generate summaries for companies that have articles,
+        # reusing cached summaries where the article set is unchanged
+        pending = {}
         for company_name, articles in news_data.items():
-            if articles:  # Only generate summary if there are articles
-                logger.info(f"Generating summary for {company_name}...")
-                summary = self.summarize_company_news(company_name, articles)
-                summaries[company_name] = summary
+            if not articles:
+                continue
+
+            cached = self.cache.get(self._cache_key(company_name, articles))
+            if cached is not None:
+                logger.info(f"Using cached AI summary for {company_name}")
+                summaries[company_name] = cached
             else:
-                summaries[company_name] = None
+                pending[company_name] = articles
+
+        if not pending:
+            return summaries
+
+        # Summarize several companies per call to cut per-request overhead
+        names = list(pending)
+        batches = [
+            {company_name: pending[company_name] for company_name in names[i:i + BATCH_SIZE]}
+            for i in range(0, len(names), BATCH_SIZE)
+        ]
+
+        def summarize(batch):
+            logger.info(f"Generating summaries for {', '.join(batch)}...")
+            return self.summarize_batch(batch)
+
+        # API calls are independent and I/O bound, so issue them concurrently;
+        # the Anthropic client is thread-safe and shared across workers
+        with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(pending))) as executor:
+            batch_futures = [executor.submit(summarize, batch) for batch in batches]
+
+            # Companies a batch couldn't cover go back through the same pool
+            individual_futures = {}
+            for batch, future in zip(batches, batch_futures):
+                batch_summaries = future.result()
+                summaries.update(batch_summaries)
+                for company_name, articles in batch.items():
+                    if company_name not in batch_summaries:
+                        individual_futures[company_name] = executor.submit(
+                            self.summarize_company_news, company_name, articles
+                        )
+
+            for company_name, future in individual_futures.items():
+                summaries[company_name] = future.result()
 
         return summaries
@@ -2,22 +2,34 @@
 Digest Generator Module - Formats portfolio data into a readable email digest
 """
 
+import io
+from collections import namedtuple
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, TextIO, Tuple
+
+from src.funding_tracker import FundingTracker
+
+# Portfolio-wide counts shared by the executive summary and the subject line
+Stats = namedtuple("Stats", "n_companies n_with_news n_articles")
 
 
 class DigestGenerator:
     """Generates formatted email digests from portfolio company data"""
 
+    _EQ = "=" * 80
+    _DASH = "-" * 80
+
     def __init__(self):
         self.digest_date = datetime.now().strftime('%B %d, %Y')
+        self.last_stats: Optional[Stats] = None
 
     def generate_digest(
         self,
         news_data: Dict[str, List[Dict]],
         funding_data: Dict[str, Dict] = None,
-        ai_summaries: Dict[str, Optional[str]] = None
-    ) -> str:
+        ai_summaries: Dict[str, Optional[str]] = None,
+        out: Optional[TextIO] = None
+    ) -> Optional[str]:
         """
         Generate a complete email digest
 
@@ -25,111 +37,144 @@ class DigestGenerator:
             news_data: Dictionary mapping company names to news articles
             funding_data: Optional dictionary mapping company names to funding info
             ai_summaries: Optional dictionary mapping company names to AI-generated summaries
+            out: Optional text stream to write the digest to as it is generated
+
+        The portfolio counts are stored on self.last_stats for generate_subject_line.
 
         Returns:
-            Formatted digest as a string
+            Formatted digest as a string, or None if it was written to out
         """
-        lines = []
+        if out is None:
+            buffer = io.StringIO()
+            self.generate_digest(news_data, funding_data, ai_summaries, out=buffer)
+            return buffer.getvalue()
+
+        now = datetime.now()
 
         # Header
-        lines.append("=" * 80)
-        lines.append("PORTFOLIO WEEKLY DIGEST")
-        lines.append(f"Week of {self.digest_date}")
-        lines.append("=" * 80)
-        lines.append("")
+        out.write("\n".join([
+            self._EQ,
+            "PORTFOLIO WEEKLY DIGEST",
+            f"Week of {self.digest_date}",
+            self._EQ,
+            "",
+            ""
+        ]))
+
+        # Count articles and split companies with/without news in a single pass
+        total_articles = 0
+        companies_with_news = []
+        companies_without_news = []
+        for company_name, articles in news_data.items():
+            if articles:
+                total_articles += len(articles)
+                companies_with_news.append((company_name, articles))
+            else:
+                companies_without_news.append(company_name)
+
+        self.last_stats = Stats(len(news_data), len(companies_with_news), total_articles)
 
         # Executive Summary
-        lines.append(self._generate_summary(news_data))
-        lines.append("")
+        self._write_summary(out, self.last_stats, companies_with_news)
+        out.write("\n")
 
         # Detailed company reports
-        lines.append("=" * 80)
-        lines.append("DETAILED COMPANY REPORTS")
-        lines.append("=" * 80)
-        lines.append("")
+        out.write("\n".join([
+            self._EQ,
+            "DETAILED COMPANY REPORTS",
+            self._EQ,
+            "",
+            ""
+        ]))
 
         # Sort companies: those with news first, then alphabetically
-        companies_with_news = [(name, articles) for name, articles in news_data.items() if articles]
-        companies_without_news = [(name, articles) for name, articles in news_data.items() if not articles]
-
+        # (the executive summary above keeps the configured order)
         companies_with_news.sort(key=lambda x: x[0])
-        companies_without_news.sort(key=lambda x: x[0])
+        companies_without_news.sort()
 
         # Companies with news
         for company_name, articles in companies_with_news:
             ai_summary = ai_summaries.get(company_name) if ai_summaries else None
-            lines.append(self._format_company_section(
+            self._write_company_section(
+                out,
                 company_name,
                 articles,
                 funding_data.get(company_name) if funding_data else None,
                 ai_summary
-            ))
-            lines.append("")
+            )
+            out.write("\n")
 
         # Companies without news (brief mention)
         if companies_without_news:
-            lines.append("-" * 80)
-            lines.append("NO NEWS THIS WEEK")
-            lines.append("-" * 80)
-            lines.append("")
-
-            for company_name, _ in companies_without_news:
+            lines = [
+                self._DASH,
+                "NO NEWS THIS WEEK",
+                self._DASH,
+                ""
+            ]
+
+            for company_name in companies_without_news:
                 lines.append(f"  • {company_name}")
 
             lines.append("")
+            lines.append("")
+            out.write("\n".join(lines))
 
         # Footer
-        lines.append("=" * 80)
-        lines.append(f"End of digest - Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("=" * 80)
+        out.write("\n".join([
+            self._EQ,
+            f"End of digest - Generated on {now.strftime('%Y-%m-%d %H:%M:%S')}",
+            self._EQ
+        ]))
 
-        return "\n".join(lines)
+        return None
 
-    def _generate_summary(self, news_data: Dict[str, List[Dict]]) -> str:
-        """Generate executive summary section"""
+    def _write_summary(
+        self,
+        out: TextIO,
+        stats: Stats,
+        companies_with_news: List[Tuple[str, List[Dict]]]
+    ) -> None:
+        """Write executive summary section"""
         lines = []
-        lines.append("-" * 80)
+        lines.append(self._DASH)
         lines.append("EXECUTIVE SUMMARY")
-        lines.append("-" * 80)
+        lines.append(self._DASH)
         lines.append("")
 
-        total_companies = len(news_data)
-        companies_with_news = sum(1 for articles in news_data.values() if articles)
-        total_articles = sum(len(articles) for articles in news_data.values())
-
-        lines.append(f"  Portfolio Companies: {total_companies}")
-        lines.append(f"  Companies with News: {companies_with_news}")
-        lines.append(f"  Total Articles: {total_articles}")
+        lines.append(f"  Portfolio Companies: {stats.n_companies}")
+        lines.append(f"  Companies with News: {stats.n_with_news}")
+        lines.append(f"  Total Articles: {stats.n_articles}")
         lines.append("")
 
-        if companies_with_news > 0:
+        if companies_with_news:
             lines.append("  Companies in the news this week:")
-            for company_name, articles in news_data.items():
-                if articles:
-                    lines.append(f"    • {company_name} ({len(articles)} articles)")
+            for company_name, articles in companies_with_news:
+                lines.append(f"    • {company_name} ({len(articles)} articles)")
         else:
             lines.append("  No companies had news this week.")
 
-        return "\n".join(lines)
+        lines.append("")
+        out.write("\n".join(lines))
 
-    def _format_company_section(
+    def _write_company_section(
         self,
+        out: TextIO,
         company_name: str,
         articles: List[Dict],
         funding_info: Dict = None,
         ai_summary: Optional[str] = None
-    ) -> str:
-        """Format a single company's section"""
+    ) -> None:
+        """Write a single company's section"""
         lines = []
 
-        lines.append("-" * 80)
+        lines.append(self._DASH)
         lines.append(f"{company_name.upper()}")
-        lines.append("-" * 80)
+        lines.append(self._DASH)
         lines.append("")
 
         # Funding information (if available)
         if funding_info:
-            from src.funding_tracker import FundingTracker
             funding_summary = FundingTracker.format_funding_summary(funding_info)
             if funding_summary != "No recent public funding data available":
                 lines.append(f"Funding: {funding_summary}")
@@ -162,18 +207,16 @@ class DigestGenerator:
             lines.append("No news this week.")
             lines.append("")
 
-        return "\n".join(lines)
-
-    def generate_subject_line(self, news_data: Dict[str, List[Dict]]) -> str:
-        """Generate email subject line"""
-        companies_with_news = sum(1 for articles in news_data.values() if articles)
-        total_articles = sum(len(articles) for articles in news_data.values())
+        lines.append("")
+        out.write("\n".join(lines))
 
+    def generate_subject_line(self, stats: Stats) -> str:
+        """Generate email subject line from the stats computed by generate_digest"""
         week_of = datetime.now().strftime('%m/%d/%Y')
 
-        if total_articles == 0:
+        if stats.n_articles == 0:
             return f"Portfolio Digest - Week of {week_of} - Quiet Week"
-        elif companies_with_news == 1:
+        elif stats.n_with_news == 1:
             return f"Portfolio Digest - Week of {week_of} - 1 Company Update"
         else:
-            return f"Portfolio Digest - Week of {week_of} - {companies_with_news} Companies with News"
+            return f"Portfolio Digest - Week of {week_of} - {stats.n_with_news} Companies with News"
@@ -0,0 +1,92 @@
+"""
+Disk Cache Module - Small persistent key/value cache shared across runs
+"""
+
+import os
+import time
+import shelve
+import logging
+import threading
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """Thread-safe, shelve-backed cache with an in-memory layer and optional time-to-live"""
+
+    def __init__(self, path: str, ttl: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            path: Path of the shelf file (parent directories are created)
+            ttl: Seconds before an entry expires (None means never)
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._memory = {}  # Entries already read or written this run
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        if ttl is not None:
+            self._prune()
+
+    def _prune(self) -> None:
+        """Delete expired entries so the shelf doesn't grow without bound"""
+        cutoff = time.time() - self.ttl
+        try:
+            with shelve.open(self.path) as db:
+                expired = [key for key, (stored_at, _) in db.items() if stored_at < cutoff]
+                for key in expired:
+                    del db[key]
+        except Exception as e:
+            logger.warning(f"Could not prune cache {self.path}: {e}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a cached value
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None if missing, expired or unreadable
+        """
+        try:
+            with self._lock:
+                entry = self._memory.get(key)
+                if entry is None:
+                    with shelve.open(self.path) as db:
+                        entry = db.get(key)
+                    if entry is not None:
+                        self._memory[key] = entry
+        except Exception as e:
+            logger.warning(f"Could not read cache {self.path}: {e}")
+            return None
+
+        if entry is None:
+            return None
+
+        stored_at, value = entry
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            return None
+
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """
+        Store a value in the cache
+
+        Args:
+            key: Cache key
+            value: Any picklable value
+        """
+        entry = (time.time(), value)
+        try:
+            with self._lock:
+                self._memory[key] = entry
+                with shelve.open(self.path) as db:
+                    db[key] = entry
+        except Exception as e:
+            logger.warning(f"Could not write cache {self.path}: {e}")
@@ -8,7 +8,6 @@ from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import Optional
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +35,60 @@ class EmailSender:
         self.smtp_host = smtp_host
         self.smtp_port = smtp_port
 
+        # Authenticated connection kept open while used as a context manager
+        self._server: Optional[smtplib.SMTP] = None
+        self._keep_alive = False
+
+    def __enter__(self) -> "EmailSender":
+        """Reuse one SMTP connection for every send inside the with-block"""
+        self._keep_alive = True
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self._keep_alive = False
+        self._disconnect()
+
+    def _connect(self) -> smtplib.SMTP:
+        """Open a secured, authenticated SMTP connection"""
+        logger.info(f"Connecting to SMTP server: {self.smtp_host}:{self.smtp_port}")
+
+        server = smtplib.SMTP(self.smtp_host, self.smtp_port)
+        try:
+            server.starttls()  # Secure the connection
+            server.login(self.smtp_email, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _disconnect(self) -> None:
+        """Close the cached SMTP connection, if any"""
+        if self._server is None:
+            return
+
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
+    def _send(self, message: MIMEMultipart) -> None:
+        """Send a message over the cached connection, or a one-shot one"""
+        if not self._keep_alive:
+            with self._connect() as server:
+                server.send_message(message)
+            return
+
+        if self._server is None:
+            self._server = self._connect()
+
+        try:
+            self._server.send_message(message)
+        except Exception:
+            # Drop a broken connection so the next send reconnects
+            self._disconnect()
+            raise
+
     def send_digest(
         self,
         recipient_email: str,
@@ -66,15 +119,8 @@ class EmailSender:
             text_part = MIMEText(body, "plain")
             message.attach(text_part)
 
-            # Connect to SMTP server and send
-            logger.info(f"Connecting to SMTP server: {self.smtp_host}:{self.smtp_port}")
-
-            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
-                server.starttls()  # Secure the connection
-                server.login(self.smtp_email, self.smtp_password)
-
-                logger.info(f"Sending email to: {recipient_email}")
-                server.send_message(message)
+            logger.info(f"Sending email to: {recipient_email}")
+            self._send(message)
 
             logger.info("Email sent successfully!")
             return True
@@ -2,15 +2,27 @@
 Funding Tracker Module - Attempts to find public funding information for companies
 """
 
+import re
+import time
 import logging
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional
-from bs4 import BeautifulSoup
-import time
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of funding lookups in flight at once
+MAX_CONCURRENT_LOOKUPS = 4
+
+# Minimum spacing between the start of consecutive lookups, in seconds
+MIN_REQUEST_INTERVAL = 1.0
+
+# Funding-related keywords, matched in a single pass over the raw response bytes
+_FUND_RE = re.compile(rb"raised|funding|valuation|Series|million|billion", re.IGNORECASE)
+
+# Bytes carried between streamed chunks so a keyword split across them still matches
+_FUND_RE_OVERLAP = len(b"valuation") - 1
+
 
 class FundingTracker:
     """
@@ -23,6 +35,34 @@ class FundingTracker:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
 
+        # Deferred so importing this module (e.g. for format_funding_summary) stays cheap
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # Shared session with one pooled connection per worker. A lookup that
+        # stops reading early closes its connection instead of reusing it.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=MAX_CONCURRENT_LOOKUPS,
+            pool_maxsize=MAX_CONCURRENT_LOOKUPS
+        )
+        self.session.mount('https://', adapter)
+
+        # Shared pacing gate so concurrent workers stay polite
+        self._pace_lock = threading.Lock()
+        self._next_request_at = 0.0
+
+    def _wait_for_turn(self) -> None:
+        """Block until MIN_REQUEST_INTERVAL has passed since the previous lookup started"""
+        with self._pace_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_request_at)
+            self._next_request_at = start_at + MIN_REQUEST_INTERVAL
+
+        if start_at > now:
+            time.sleep(start_at - now)
+
     def get_funding_info(self, company_name: str) -> Dict[str, Optional[str]]:
         """
         Attempt to find funding information for a company
@@ -47,22 +87,18 @@ class FundingTracker:
             # This is a best-effort approach since most private companies don't publish this data
             search_url = f"https://www.google.com/search?q={company_name}+funding+round+valuation"
 
-            response = requests.get(search_url, headers=self.headers, timeout=10)
-
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-
-                # Look for funding-related snippets in search results
-                # Note: This is intentionally simple and best-effort
-                text = soup.get_text()
-
-                # Check if there are mentions of funding
-                funding_keywords = ['raised', 'funding', 'valuation', 'Series', 'million', 'billion']
-                if any(keyword in text for keyword in funding_keywords):
-                    funding_info['status'] = 'Some funding information may be available in search results'
-
-            # Add a small delay to be respectful
-            time.sleep(1)
+            with self.session.get(search_url, stream=True, timeout=10) as response:
+                if response.status_code == 200:
+                    # Look for mentions of funding in the search results, stopping
+                    # the download as soon as one is found (this drops the
+                    # connection, which is cheaper than reading the rest of the page)
+                    # Note: This is intentionally simple and best-effort
+                    tail = b''
+                    for chunk in response.iter_content(65536):
+                        if _FUND_RE.search(tail + chunk):
+                            funding_info['status'] = 'Some funding information may be available in search results'
+                            break
+                        tail = chunk[-_FUND_RE_OVERLAP:]
 
         except Exception as e:
             logger.warning(f"Could not fetch funding info for {company_name}: {e}")
@@ -79,7 +115,7 @@ class FundingTracker:
         Returns:
             Dictionary mapping company names to their funding info
         """
-        results = {}
+        queries = []
 
         for company in companies:
             # Handle both string and dict formats
@@ -93,12 +129,25 @@ class FundingTracker:
             if not display_name:
                 continue
 
-            logger.info(f"Checking funding info for: {display_name}")
-            results[display_name] = self.get_funding_info(search_query)
-            # Be respectful with rate limiting
-            time.sleep(2)
+            queries.append((display_name, search_query))
+
+        if not queries:
+            return {}
 
-        return results
+        def lookup(query):
+            display_name, search_query = query
+            # Be respectful with rate limiting
+            self._wait_for_turn()
+            logger.info(f"Checking funding info for: {display_name}")
+            return self.get_funding_info(search_query)
+
+        # Lookups are independent HTTP requests, so run a bounded number concurrently
+        with ThreadPoolExecutor(max_workers=min(MAX_CONCURRENT_LOOKUPS, len(queries))) as executor:
+            funding = executor.map(lookup, queries)
+            return {
+                display_name: funding_info
+                for (display_name, _), funding_info in zip(queries, funding)
+            }
 
     @staticmethod
     def format_funding_summary(funding_info: Dict) -> str:
@@ -2,29 +2,136 @@
 News Fetcher Module - Fetches recent news for portfolio companies using Google News RSS
 """
 
+import re
+import html
+import time
 import logging
 import requests
-import xml.etree.ElementTree as ET
-from datetime import datetime, timedelta
-from typing import List, Dict
-from dateutil import parser as date_parser
+from requests.adapters import HTTPAdapter
+from requests.utils import DEFAULT_ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+try:
+    from lxml import etree as ET  # libxml2-backed, much faster than the stdlib parser
+    # Feeds are untrusted input: never expand entities or fetch external DTDs
+    # (lxml < 5.0 resolves entities by default)
+    _PARSER_OPTIONS = {'resolve_entities': False, 'no_network': True}
+except ImportError:
+    import xml.etree.ElementTree as ET
+    _PARSER_OPTIONS = {}  # The stdlib parser never fetches external entities
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlencode
+from typing import List, Dict, Optional, Set, Tuple
+
+from src.disk_cache import DiskCache
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Default maximum number of RSS feeds fetched at once (keeps large
+# portfolios from hammering news.google.com into 429 responses)
+MAX_CONCURRENT_FETCHES = 10
+
+# Matches HTML tags in RSS descriptions, including one cut off at the end
+_TAG_RE = re.compile(r'<[^>]*(?:>|$)')
+
+# Raw description characters kept before cleaning; leaves ample margin for
+# tag markup around the 200 characters of text we actually show
+_RAW_SUMMARY_LIMIT = 1024
+
+
+def _clean_summary(summary: str) -> str:
+    """Clean HTML tags from summary text"""
+    # Remove HTML tags, then decode entities like &amp; and &nbsp;
+    raw = summary[:_RAW_SUMMARY_LIMIT]
+    clean_text = html.unescape(_TAG_RE.sub('', raw)).strip()
+    # Limit length
+    if len(clean_text) > 200:
+        clean_text = clean_text[:200] + '...'
+    return clean_text
+
+
+def _recent_day_strings(now: datetime, days_back: int) -> Set[str]:
+    """
+    Build the "DD Mon YYYY" strings a pubDate in the last N days can contain
+
+    One extra day on each side covers pubDates in non-UTC timezones, and
+    unpadded day numbers are included since RFC-822 allows them.
+    """
+    days = set()
+    for offset in range(-1, days_back + 2):
+        day = now - timedelta(days=offset)
+        days.add(day.strftime('%d %b %Y'))
+        days.add(f"{day.day} {day.strftime('%b %Y')}")
+    return days
+
+
+def _parse_pubdate(text: str) -> datetime:
+    """Parse an RFC-822 pubDate (e.g. 'Mon, 14 Oct 2024 13:45:00 GMT') as aware UTC"""
+    try:
+        pub_date = parsedate_to_datetime(text)
+    except (TypeError, ValueError):
+        pub_date = datetime.strptime(text, '%a, %d %b %Y %H:%M:%S %Z')
+
+    # Dates without a usable offset are GMT per the RSS spec
+    if pub_date.tzinfo is None:
+        return pub_date.replace(tzinfo=timezone.utc)
+    return pub_date.astimezone(timezone.utc)
+
+
+def _in_window(entries: List[Tuple[Optional[float], Dict]], cutoff_ts: float) -> List[Dict]:
+    """Articles from cached (timestamp, article) entries still inside the window"""
+    return [article for published_ts, article in entries
+            if published_ts is None or published_ts >= cutoff_ts]
+
 
 class NewsFetcher:
     """Fetches news articles for companies using Google News RSS feeds"""
 
-    def __init__(self, days_back: int = 7):
+    def __init__(
+        self,
+        days_back: int = 7,
+        cache_ttl: int = 1800,
+        cache_path: str = ".cache/news",
+        max_concurrency: int = MAX_CONCURRENT_FETCHES
+    ):
         """
         Initialize the news fetcher
 
         Args:
             days_back: Number of days to look back for news (default: 7)
+            cache_ttl: Seconds a fetched feed is reused without revalidation (default: 1800)
+            cache_path: Path of the on-disk feed cache
+            max_concurrency: Maximum number of feeds fetched at once (default: 10)
         """
         self.days_back = days_back
+        self.max_concurrency = max_concurrency
         self.base_url = "https://news.google.com/rss/search"
+        self._tail = {'hl': 'en-US', 'gl': 'US', 'ceid': 'US:en'}  # Fixed locale params
+
+        # Stale entries are kept so they can be revalidated with ETag/Last-Modified,
+        # but dropped once everything they hold has aged out of the window
+        self.cache_ttl = cache_ttl
+        self.cache = DiskCache(cache_path, ttl=max(cache_ttl, days_back * 24 * 60 * 60))
+
+        # One pooled session shared by all fetch workers: caps open connections
+        # and requests compressed feeds. Only fully read responses (304s, short
+        # feeds) hand their connection back; a feed abandoned after 10 items is
+        # closed, since draining the rest would cost more than reconnecting.
+        self.session = requests.Session()
+        self.session.headers.update({
+            # gzip, deflate, plus br/zstd when urllib3 can decode them while streaming
+            'Accept-Encoding': DEFAULT_ACCEPT_ENCODING,
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+        })
+        adapter = HTTPAdapter(
+            pool_connections=max_concurrency,
+            pool_maxsize=max_concurrency,
+            pool_block=True,  # Never open more connections than the concurrency limit
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        )
+        self.session.mount('https://', adapter)
 
     def fetch_company_news(self, company_name: str) -> List[Dict]:
         """
@@ -37,84 +144,155 @@ class NewsFetcher:
             List of news articles with title, link, published date, and summary
         """
         try:
-            # Construct Google News RSS URL
+            # Construct Google News RSS URL (exact-phrase search, properly escaped)
             query = f'"{company_name}"'
-            url = f"{self.base_url}?q={query}&hl=en-US&gl=US&ceid=US:en"
+            url = f"{self.base_url}?{urlencode({'q': query, **self._tail})}"
+
+            # Filter and format articles from the last N days
+            now = datetime.now(timezone.utc)
+            cutoff_ts = (now - timedelta(days=self.days_back)).timestamp()
+            recent_days = _recent_day_strings(now, self.days_back)
+
+            # Serve recent results from the cache; otherwise revalidate them.
+            # Cached articles are re-filtered since the window has moved on.
+            cache_key = f"{self.days_back}:{company_name}"
+            cached = self.cache.get(cache_key)
+            if cached and 'entries' not in cached:
+                cached = None  # Written before article timestamps were cached
+            conditional_headers = {}
+            if cached:
+                if time.time() - cached['fetched_at'] < self.cache_ttl:
+                    logger.info(f"Using cached news for: {company_name}")
+                    return _in_window(cached['entries'], cutoff_ts)
+                if cached['etag']:
+                    conditional_headers['If-None-Match'] = cached['etag']
+                if cached['last_modified']:
+                    conditional_headers['If-Modified-Since'] = cached['last_modified']
 
             logger.info(f"Fetching news for: {company_name}")
 
-            # Fetch RSS feed
-            response = requests.get(url, timeout=10)
-            response.raise_for_status()
+            entries = []
+            item_count = 0
 
-            # Parse XML
-            root = ET.fromstring(response.content)
+            # Stream the RSS feed straight into the parser, stopping once
+            # enough items have been seen instead of downloading the whole feed
+            # (the connection is then closed rather than returned to the pool)
+            with self.session.get(url, headers=conditional_headers, stream=True, timeout=10) as response:
+                if cached and response.status_code == 304:
+                    logger.info(f"News unchanged for: {company_name}")
+                    self.cache.set(cache_key, dict(cached, fetched_at=time.time()))
+                    return _in_window(cached['entries'], cutoff_ts)
 
-            # Find all items in the RSS feed
-            items = root.findall('.//item')
+                response.raise_for_status()
+                response.raw.decode_content = True  # Decompress while streaming
 
-            if not items:
+                for _, item in ET.iterparse(response.raw, events=('end',), **_PARSER_OPTIONS):
+                    if item.tag != 'item':
+                        continue
+
+                    item_count += 1
+                    try:
+                        entry = self._parse_item(item, cutoff_ts, recent_days)
+                        if entry:
+                            entries.append(entry)
+                    except Exception as e:
+                        logger.warning(f"Error parsing article for {company_name}: {e}")
+
+                    item.clear()
+                    if item_count >= 10:  # Limit to top 10 results
+                        break
+
+                self.cache.set(cache_key, {
+                    'fetched_at': time.time(),
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'entries': entries
+                })
+
+            if not item_count:
                 logger.info(f"No news found for {company_name}")
                 return []
 
-            # Filter and format articles from the last N days
-            cutoff_date = datetime.now() - timedelta(days=self.days_back)
-            articles = []
-
-            for item in items[:10]:  # Limit to top 10 results
-                try:
-                    title_elem = item.find('title')
-                    link_elem = item.find('link')
-                    pub_date_elem = item.find('pubDate')
-
-                    if title_elem is None or link_elem is None:
-                        continue
-
-                    title = title_elem.text
-                    link = link_elem.text
-
-                    # Parse publication date
-                    if pub_date_elem is not None and pub_date_elem.text:
-                        pub_date = date_parser.parse(pub_date_elem.text)
-
-                        # Only include articles from the past N days
-                        if pub_date.replace(tzinfo=None) < cutoff_date:
-                            continue
-
-                        published_str = pub_date.strftime('%Y-%m-%d %H:%M')
-                    else:
-                        published_str = 'Unknown date'
-
-                    # Try to get source from description
-                    source = 'Unknown'
-                    desc_elem = item.find('description')
-                    if desc_elem is not None and desc_elem.text:
-                        # Google News RSS often includes source in description
-                        desc_text = desc_elem.text
-                        summary = self._clean_summary(desc_text)
-                    else:
-                        summary = ''
-
-                    article = {
-                        'title': title,
-                        'link': link,
-                        'published': published_str,
-                        'source': source,
-                        'summary': summary
-                    }
-                    articles.append(article)
-
-                except Exception as e:
-                    logger.warning(f"Error parsing article for {company_name}: {e}")
-                    continue
-
-            logger.info(f"Found {len(articles)} recent articles for {company_name}")
-            return articles
+            logger.info(f"Found {len(entries)} recent articles for {company_name}")
+            return [article for _, article in entries]
 
         except Exception as e:
             logger.error(f"Error fetching news for {company_name}: {e}")
             return []
 
+    def _parse_item(
+        self,
+        item,
+        cutoff_ts: float,
+        recent_days: Set[str]
+    ) -> Optional[Tuple[Optional[float], Dict]]:
+        """
+        Convert an RSS <item> into an article dict
+
+        Args:
+            item: Parsed <item> element
+            cutoff_ts: Articles published before this Unix timestamp are skipped
+            recent_days: "DD Mon YYYY" strings of the days inside the window
+
+        Returns:
+            (publication timestamp or None, article dict), or None if the item
+            is incomplete or too old
+        """
+        # Index the children in one pass instead of a find() scan per field
+        children = {}
+        for child in item:
+            children.setdefault(child.tag, child)  # First match wins, like find()
+
+        title_elem = children.get('title')
+        link_elem = children.get('link')
+        pub_date_elem = children.get('pubDate')
+
+        if title_elem is None or link_elem is None:
+            return None
+
+        title = title_elem.text
+        link = link_elem.text
+
+        # Parse publication date
+        if pub_date_elem is not None and pub_date_elem.text:
+            # Cheap substring check first so old articles skip the full parse
+            if not any(day in pub_date_elem.text for day in recent_days):
+                return None
+
+            pub_date = _parse_pubdate(pub_date_elem.text)
+
+            # Only include articles from the past N days
+            published_ts = pub_date.timestamp()
+            if published_ts < cutoff_ts:
+                return None
+
+            # Fixed ASCII format, so skip locale-aware strftime
+            published_str = (
+                f"{pub_date.year:04d}-{pub_date.month:02d}-{pub_date.day:02d} "
+                f"{pub_date.hour:02d}:{pub_date.minute:02d}"
+            )
+        else:
+            published_ts = None
+            published_str = 'Unknown date'
+
+        # Try to get source from description
+        source = 'Unknown'
+        desc_elem = children.get('description')
+        if desc_elem is not None and desc_elem.text:
+            # Google News RSS often includes source in description
+            desc_text = desc_elem.text
+            summary = _clean_summary(desc_text)
+        else:
+            summary = ''
+
+        return published_ts, {
+            'title': title,
+            'link': link,
+            'published': published_str,
+            'source': source,
+            'summary': summary
+        }
+
     def fetch_all_companies_news(self, companies: List) -> Dict[str, List[Dict]]:
         """
         Fetch news for multiple companies
@@ -125,7 +303,9 @@ class NewsFetcher:
         Returns:
             Dictionary mapping company names to their news articles
         """
-        results = {}
+        # Group companies by search query so shared queries are fetched once
+        query_to_displays = defaultdict(list)
+        queries = []
 
         for company in companies:
             # Handle both string and dict formats
@@ -139,23 +319,24 @@ class NewsFetcher:
             if not display_name:
                 continue
 
-            logger.info(f"Searching for: {display_name} (query: {search_query})")
-            articles = self.fetch_company_news(search_query)
-            results[display_name] = articles
+            query_to_displays[search_query].append(display_name)
+            queries.append((display_name, search_query))
 
-        return results
+        if not queries:
+            return {}
 
-    @staticmethod
-    def _clean_summary(summary: str) -> str:
-        """Clean HTML tags from summary text"""
-        from bs4 import BeautifulSoup
+        def fetch(search_query):
+            display_names = ", ".join(query_to_displays[search_query])
+            logger.info(f"Searching for: {display_names} (query: {search_query})")
+            return self.fetch_company_news(search_query)
 
-        try:
-            # Remove HTML tags
-            clean_text = BeautifulSoup(summary, 'html.parser').get_text()
-            # Limit length
-            if len(clean_text) > 200:
-                clean_text = clean_text[:200] + '...'
-            return clean_text.strip()
-        except:
-            return summary[:200] if len(summary) > 200 else summary
+        # Feeds are independent I/O-bound requests, so fetch them concurrently,
+        # bounded so large portfolios don't trigger rate limiting
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(query_to_displays))) as executor:
+            news = dict(zip(query_to_displays, executor.map(fetch, query_to_displays)))
+
+        # Fan results back out in the configured company order
+        return {
+            display_name: list(news[search_query])
+            for display_name, search_query in queries
+        }